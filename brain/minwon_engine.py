@@ -113,6 +113,41 @@ NORMALIZE_MAP = {
     "나무가 쓰러져": "가로수 쓰러짐",
 }
 
+# import 시 한 번만 컴파일해 두고, 매 호출마다 텍스트를 한 번만 훑도록 함
+CRITICAL_RE = re.compile("|".join(CRITICAL_PATTERNS))
+KEYWORD_SPLIT_RE = re.compile(r"[,\s\.]+")
+
+# -------------------- 규칙 기반 1차 분류 패턴 --------------------
+# (패턴, minwon_type, needs_visit_rule) — 위에서부터 먼저 걸리는 것이 우선
+RULE_PATTERNS: List[Tuple["re.Pattern[str]", str, bool]] = [
+    # 심리지원
+    (re.compile(r"우울|불안|잠이 안|죽고 싶|괴로워"), "심리지원", False),
+    # 연금/복지
+    (re.compile(r"연금|국민연금|기초연금|복지|수급자"), "연금/복지", False),
+    # 도로
+    (re.compile(r"도로|길이|포트홀|구멍|보도블록|보도블럭|맨홀"), "도로", True),
+    # 시설물
+    (re.compile(r"가로등|신호등|공원|벤치|놀이터|체육시설|건물"), "시설물", True),
+    # 소음/생활민원
+    (re.compile(r"소음|시끄럽|담배냄새|악취|쓰레기|무단투기"), "생활민원", False),
+    # 치안 비슷한 표현
+    (re.compile(r"싸움|폭행|위협|스토킹"), "생활민원", False),
+]
+
+
+def _first_chars(patterns: List[str]) -> frozenset:
+    """
+    패턴의 각 대안('|'로 나뉜 부분)의 첫 글자 모음.
+    (모든 대안이 정규식 기호가 아닌 일반 글자로 시작한다고 가정)
+    """
+    return frozenset(alt[0] for pat in patterns for alt in pat.split("|"))
+
+
+# 짧은 문장 빠른 경로: 이 글자가 하나도 없으면 어떤 패턴에도 걸릴 수 없음
+SHORT_TEXT_LEN = 50
+CRITICAL_TRIGGER_CHARS = _first_chars(CRITICAL_PATTERNS)
+RULE_TRIGGER_CHARS = _first_chars([p.pattern for p, _, _ in RULE_PATTERNS])
+
 # -------------------- 국민연금 출생연도별 지급 개시 연령 --------------------
 PENSION_RULES = [
     {"start": 1953, "end": 1956, "old_age": 61, "early": 56},
@@ -133,6 +168,7 @@ def compute_pension_age(birth_year: int, kind: str = "old") -> int:
 
 # -------------------- 공통 유틸 --------------------
 def normalize(text: str) -> str:
+    # 순서대로 치환 (앞 치환 결과에 뒤 치환이 다시 적용될 수 있음)
     t = text.strip()
     for k, v in NORMALIZE_MAP.items():
         t = t.replace(k, v)
@@ -141,19 +177,15 @@ def normalize(text: str) -> str:
 
 def is_critical(text: str) -> bool:
     t = normalize(text)
-    for pat in CRITICAL_PATTERNS:
-        if re.search(pat, t):
-            return True
-    return False
+    if len(t) < SHORT_TEXT_LEN and CRITICAL_TRIGGER_CHARS.isdisjoint(t):
+        return False
+    return CRITICAL_RE.search(t) is not None
 
 
 def extract_keywords(text: str, max_k: int = 5) -> List[str]:
-    tokens = re.split(r"[,\s\.]+", text)
-    tokens = [w for w in tokens if len(w) >= 2]
-    uniq = []
-    for w in tokens:
-        if w not in uniq:
-            uniq.append(w)
+    tokens = KEYWORD_SPLIT_RE.split(text)
+    # dict.fromkeys: 등장 순서를 유지하면서 중복 제거
+    uniq = list(dict.fromkeys(w for w in tokens if len(w) >= 2))
     return uniq[:max_k]
 
 
@@ -184,29 +216,13 @@ def rule_first_classify(text: str) -> Tuple[str, bool]:
     """
     t = normalize(text)
 
-    # 심리지원
-    if re.search(r"우울|불안|잠이 안|죽고 싶|괴로워", t):
-        return "심리지원", False
+    # 짧은 문장에 키워드 첫 글자가 하나도 없으면 바로 기타
+    if len(t) < SHORT_TEXT_LEN and RULE_TRIGGER_CHARS.isdisjoint(t):
+        return "기타", False
 
-    # 연금/복지
-    if re.search(r"연금|국민연금|기초연금|복지|수급자", t):
-        return "연금/복지", False
-
-    # 도로
-    if re.search(r"도로|길이|포트홀|구멍|보도블록|보도블럭|맨홀", t):
-        return "도로", True
-
-    # 시설물
-    if re.search(r"가로등|신호등|공원|벤치|놀이터|체육시설|건물", t):
-        return "시설물", True
-
-    # 소음/생활민원
-    if re.search(r"소음|시끄럽|담배냄새|악취|쓰레기|무단투기", t):
-        return "생활민원", False
-
-    # 치안 비슷한 표현
-    if re.search(r"싸움|폭행|위협|스토킹", t):
-        return "생활민원", False
+    for pattern, minwon_type, needs_visit_rule in RULE_PATTERNS:
+        if pattern.search(t):
+            return minwon_type, needs_visit_rule
 
     # 규칙에 안 걸리면 기타
     return "기타", False
@@ -9,6 +9,7 @@ diarization_pyannote.py
 --------------------------------------
 1. .env 에서 HUGGINGFACE_TOKEN (pyannote용) 읽기
 2. pyannote/speaker-diarization 파이프라인 로드
+   - GPU가 있으면 GPU로 옮기고, 더미 입력으로 한 번 미리 실행(warm-up)
 3. 오디오 파일 경로를 입력받아,
    시간 구간별 화자 라벨 목록을 반환
    [
@@ -31,10 +32,15 @@ from pyannote.audio import Pipeline
 # pyannote.audio는 별도 설치가 필요합니다.
 # pip install pyannote.audio torch --extra-index-url https://download.pytorch.org/whl/cu118
 try:
+    import torch
     from pyannote.audio import Pipeline
 except ImportError:
+    torch = None
     Pipeline = None  # 타입만 맞춰두고, 실행 시 체크
 
+# warm-up에 사용할 더미 입력 (1초 무음, 16kHz mono)
+WARMUP_SAMPLE_RATE = 16000
+
 
 # -------------------------------------------------------------------
 # 환경 설정
@@ -57,10 +63,17 @@ class PyannoteDiarizer:
 
     def __init__(self,
                  hf_token: str | None = None,
-                 model_name: str = "pyannote/speaker-diarization"):
+                 model_name: str = "pyannote/speaker-diarization",
+                 device: str | None = None,
+                 warmup: bool = True,
+                 allow_tf32: bool = False):
         """
         :param hf_token: Hugging Face 토큰 (없으면 .env에서 HUGGINGFACE_TOKEN 사용)
         :param model_name: 사용할 diarization 모델 이름
+        :param device: "cuda", "cpu" 등 (없으면 GPU 사용 가능 여부로 자동 선택)
+        :param warmup: True면 초기화 시 더미 입력으로 한 번 실행해 둠
+        :param allow_tf32: True면 GPU에서 fp32 행렬곱을 TF32로 처리하도록 허용
+                           (프로세스 전체 torch 설정이 바뀌므로 기본값은 False)
         """
         if Pipeline is None:
             raise ImportError(
@@ -81,6 +94,40 @@ class PyannoteDiarizer:
             model_name,
             use_auth_token=token,
         )
+        # 토큰에 모델 접근 권한이 없으면(약관 미동의 등) 예외 대신 None이 반환됨
+        if self.pipeline is None:
+            raise RuntimeError(
+                f"pyannote 파이프라인({model_name})을 불러오지 못했습니다.\n"
+                "Hugging Face에서 모델 사용 약관에 동의했는지, 토큰 권한이 맞는지 확인해 주세요."
+            )
+
+        # GPU가 있으면 GPU에서 추론 (CPU 대비 수 배 빠름)
+        self.device = torch.device(
+            device or ("cuda" if torch.cuda.is_available() else "cpu")
+        )
+        self.pipeline.to(self.device)
+        if allow_tf32 and self.device.type == "cuda":
+            # fp32 행렬곱을 TF32로 처리하도록 허용 (Ampere 이상에서 효과)
+            torch.set_float32_matmul_precision("high")
+
+        # 첫 요청에서 CUDA 커널 준비/모델 지연 로딩 비용을 치르지 않도록 미리 실행
+        if warmup:
+            self._warmup()
+
+    def _warmup(self):
+        """
+        1초짜리 무음 waveform으로 파이프라인을 한 번 실행합니다.
+        실패해도 실제 추론에는 영향이 없으므로 경고만 남깁니다.
+        """
+        dummy = {
+            "waveform": torch.zeros(1, WARMUP_SAMPLE_RATE),
+            "sample_rate": WARMUP_SAMPLE_RATE,
+        }
+        try:
+            with torch.inference_mode():
+                self.pipeline(dummy)
+        except Exception as e:
+            print(f"[WARN] pyannote warm-up 실행 중 오류 발생: {e}")
 
     # -------------------------------------------------------------
     # 공용 메인 함수
@@ -103,7 +150,8 @@ class PyannoteDiarizer:
 
         # pyannote 파이프라인 실행
         try:
-            diarization = self.pipeline(path)
+            with torch.inference_mode():
+                diarization = self.pipeline(path)
         except Exception as e:
             print(f"[WARN] pyannote diarization 호출 중 오류 발생: {e}")
             return []
@@ -42,7 +42,7 @@ from typing import List, Dict, Any
 from pydub import AudioSegment
 
 from speaker.diarization_pyannote import PyannoteDiarizer
-from speaker.stt_whisper import transcribe_bytes
+from speaker.stt_whisper import transcribe_fileobj
 from speaker.session_state import SessionState
 from brain.minwon_engine import run_pipeline_once
 
@@ -73,12 +73,13 @@ class SpeakerPipeline:
     @staticmethod
     def _slice_audio(audio: AudioSegment,
                      start_sec: float,
-                     end_sec: float) -> bytes:
+                     end_sec: float) -> io.BytesIO:
         """
         AudioSegment 객체에서 [start_sec, end_sec] 구간을 잘라
-        WAV 포맷의 bytes 로 반환합니다.
+        WAV 포맷으로 채운 BytesIO 를 반환합니다.
 
-        Whisper STT에 전달하기 위해 BytesIO에 export하는 용도입니다.
+        Whisper STT에 그대로 전달하기 위한 용도로,
+        bytes로 꺼내 다시 감싸는 복사를 하지 않도록 버퍼 자체를 넘깁니다.
         """
         start_ms = int(start_sec * 1000)
         end_ms = int(end_sec * 1000)
@@ -88,7 +89,7 @@ class SpeakerPipeline:
         # Whisper가 안정적으로 읽을 수 있도록 WAV 형태로 export
         segment.export(buf, format="wav")
         buf.seek(0)
-        return buf.read()
+        return buf
 
     # ------------------------------------------------------------------
     # 메인: 파일 하나 전체 처리
@@ -138,10 +139,10 @@ class SpeakerPipeline:
             end = float(seg["end"])
 
             # 3-1) 오디오 자르기
-            audio_bytes = self._slice_audio(audio, start, end)
+            audio_buf = self._slice_audio(audio, start, end)
 
             # 3-2) STT
-            text = transcribe_bytes(audio_bytes, language=language, file_name="segment.wav")
+            text = transcribe_fileobj(audio_buf, language=language, file_name="segment.wav")
             if not text.strip():
                 # STT가 비어 있으면 이 구간은 스킵 (노이즈/무음 등)
                 print(f"[INFO] STT 결과 비어 있음: {speaker_id} {start:.2f}~{end:.2f}")
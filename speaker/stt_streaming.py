@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+stt_streaming.py
+
+이 모듈은 마이크/웹소켓 등으로 '조금씩 들어오는' 음성을
+로컬 faster-whisper 모델로 실시간에 가깝게 텍스트로 바꾸는 역할을 합니다.
+
+🎯 역할 요약
+--------------------------------------
+1. 들어온 오디오 조각을 세션별 버퍼에 계속 이어 붙이기 (insert_audio)
+2. 일정 간격(예: 0.5초)마다 버퍼 전체를 다시 인식 (process)
+3. 직전 라운드와 이번 라운드의 앞부분이 '두 번 연속 일치'하는 단어만 확정
+   (LocalAgreement-2 방식) → 확정된 단어만 바로 민원 엔진 쪽으로 넘길 수 있음
+4. 버퍼가 길어지면 이미 확정된 부분까지 잘라내서 인식 구간을 짧게 유지
+   (계속 확정이 안 되더라도 max_buffer_sec를 넘으면 오래된 부분을 강제로 잘라냄)
+5. 발화가 끝나면 남은 미확정 단어까지 마무리 (finish)
+
+👉 파일 전체를 다 받은 뒤 한 번에 인식하는 stt_whisper.transcribe_file 과 달리,
+   말하는 도중에도 앞부분 텍스트가 먼저 확정됩니다.
+   STT_BACKEND=local (faster-whisper) 환경에서만 사용할 수 있습니다.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from speaker.stt_whisper import local_model
+
+# faster-whisper는 16kHz mono float32 입력을 기대함
+SAMPLE_RATE = 16000
+
+# (시작 sec, 끝 sec, 단어) — 시각은 스트림 시작 기준 절대 시각
+Word = Tuple[float, float, str]
+
+
+def _norm(word: str) -> str:
+    """단어 비교용 정규화 (앞뒤 공백/문장부호 무시)"""
+    return word.strip().strip(".,?!")
+
+
+class OnlineTranscriber:
+    """
+    한 명의 화자(또는 한 세션)의 음성 스트림을 처리하는 클래스.
+
+    사용 흐름:
+        t = OnlineTranscriber()
+        while 녹음 중:
+            t.insert_audio(chunk)   # float32, 16kHz mono
+            new_text = t.process()  # 0.5초 정도마다 호출
+        rest = t.finish()
+    """
+
+    def __init__(self,
+                 model=None,
+                 language: str = "ko",
+                 buffer_trim_sec: float = 15.0,
+                 max_buffer_sec: float = 30.0,
+                 prompt_chars: int = 200):
+        """
+        :param model: faster-whisper WhisperModel (없으면 stt_whisper.local_model 사용)
+        :param language: 음성 언어 코드
+        :param buffer_trim_sec: 버퍼가 이 길이(sec)를 넘으면 확정된 지점까지 잘라냄
+        :param max_buffer_sec: 확정 여부와 관계없이 버퍼가 넘지 않도록 하는 최대 길이(sec)
+                               (넘으면 buffer_trim_sec만 남기고 앞부분을 잘라냄)
+        :param prompt_chars: 잘라낸 뒤 문맥 유지를 위해 프롬프트로 넘길 확정 텍스트 길이
+        """
+        self.model = model or local_model
+        if self.model is None:
+            raise RuntimeError(
+                "스트리밍 STT는 로컬 faster-whisper 모델이 필요합니다.\n"
+                ".env에 STT_BACKEND=local 을 설정하고 faster-whisper를 설치해 주세요."
+            )
+
+        self.language = language
+        self.buffer_trim_sec = buffer_trim_sec
+        self.max_buffer_sec = max(max_buffer_sec, buffer_trim_sec)
+        self.prompt_chars = prompt_chars
+        self.reset()
+
+    # -------------------------------------------------------------
+    # 상태 관리
+    # -------------------------------------------------------------
+
+    def reset(self):
+        """버퍼와 확정/미확정 단어를 모두 비웁니다."""
+        self.audio_buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0            # 버퍼 첫 샘플의 절대 시각(sec)
+        self.committed: List[Word] = []     # 확정된 단어들
+        self.hypothesis: List[Word] = []    # 직전 라운드의 미확정 단어들
+
+    def insert_audio(self, chunk: np.ndarray):
+        """
+        새로 들어온 오디오 조각을 버퍼 끝에 붙입니다.
+
+        :param chunk: 16kHz mono float32 (-1.0 ~ 1.0) 샘플 배열
+        """
+        self.audio_buffer = np.concatenate(
+            (self.audio_buffer, np.asarray(chunk, dtype=np.float32))
+        )
+
+    # -------------------------------------------------------------
+    # 인식 / 확정
+    # -------------------------------------------------------------
+
+    def _transcribe_buffer(self) -> List[Word]:
+        """
+        현재 버퍼 전체를 인식해서 단어 단위(절대 시각 포함) 목록으로 반환합니다.
+        """
+        # 잘려나간 앞부분 문맥만 프롬프트로 넘겨서 이어지게 함
+        # (아직 버퍼에 남아 있는 확정 단어까지 넣으면 같은 말을 또 듣게 되어 누락/중복 유발)
+        # _cut_buffer는 샘플 단위로 내림해서 자르므로 1샘플만큼 여유를 두고 비교
+        trimmed_until = self.buffer_offset + 1 / SAMPLE_RATE
+        prompt = " ".join(
+            w[2] for w in self.committed if w[1] <= trimmed_until
+        )[-self.prompt_chars:]
+
+        segments, _ = self.model.transcribe(
+            self.audio_buffer,
+            language=self.language,
+            beam_size=1,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=prompt or None,
+        )
+
+        words: List[Word] = []
+        for seg in segments:
+            for w in seg.words or []:
+                text = w.word.strip()
+                if text:
+                    words.append((self.buffer_offset + w.start,
+                                  self.buffer_offset + w.end,
+                                  text))
+        return words
+
+    def process(self) -> str:
+        """
+        버퍼를 다시 인식하고, 이번에 새로 확정된 텍스트를 반환합니다.
+        (새로 확정된 단어가 없으면 빈 문자열)
+        """
+        if self.audio_buffer.size == 0:
+            return ""
+
+        try:
+            words = self._transcribe_buffer()
+        except Exception as e:
+            print(f"[WARN] 스트리밍 STT 처리 중 오류 발생: {e}")
+            return ""
+
+        # 이미 확정된 단어(버퍼에 아직 남아 있는 부분)는 제외
+        if self.committed:
+            last_end = self.committed[-1][1]
+            words = [w for w in words if w[0] >= last_end - 0.1]
+
+        # LocalAgreement-2: 직전 라운드와 앞부분이 같은 단어까지만 확정
+        agreed: List[Word] = []
+        for prev, cur in zip(self.hypothesis, words):
+            if _norm(prev[2]) != _norm(cur[2]):
+                break
+            agreed.append(cur)
+
+        self.committed.extend(agreed)
+        self.hypothesis = words[len(agreed):]
+
+        agreed.extend(self._trim_buffer())
+        return " ".join(w[2] for w in agreed)
+
+    def _cut_buffer(self, cut_time: float):
+        """버퍼에서 cut_time(절대 시각, sec) 이전 오디오를 버립니다."""
+        cut = int((cut_time - self.buffer_offset) * SAMPLE_RATE)
+        if cut <= 0:
+            return
+        self.audio_buffer = self.audio_buffer[cut:]
+        self.buffer_offset += cut / SAMPLE_RATE
+
+    def _trim_buffer(self) -> List[Word]:
+        """
+        버퍼가 buffer_trim_sec보다 길면, 마지막 확정 단어의 끝까지 잘라냅니다.
+
+        그래도 max_buffer_sec보다 길면(무음이 이어지거나 인식 결과가 계속 바뀌어
+        확정이 안 되는 경우) buffer_trim_sec만 남기고 앞부분을 강제로 잘라냅니다.
+        이때 잘려나가는 구간의 미확정 단어는 더 이상 비교할 수 없으므로 그대로 확정합니다.
+
+        :return: 강제로 확정된 단어들
+        """
+        buffer_sec = self.audio_buffer.size / SAMPLE_RATE
+        if buffer_sec <= self.buffer_trim_sec:
+            return []
+
+        if self.committed:
+            self._cut_buffer(self.committed[-1][1])
+
+        buffer_sec = self.audio_buffer.size / SAMPLE_RATE
+        if buffer_sec <= self.max_buffer_sec:
+            return []
+
+        # 가능하면 단어 중간이 아니라 미확정 단어의 끝에서 자름
+        cut_time = self.buffer_offset + buffer_sec - self.buffer_trim_sec
+        ends = [w[1] for w in self.hypothesis
+                if self.buffer_offset < w[1] <= cut_time]
+        if ends:
+            cut_time = max(ends)
+
+        forced = [w for w in self.hypothesis if w[1] <= cut_time]
+        self.committed.extend(forced)
+        self.hypothesis = [w for w in self.hypothesis if w[0] >= cut_time]
+        self._cut_buffer(cut_time)
+        return forced
+
+    def finish(self) -> str:
+        """
+        스트림이 끝났을 때 호출합니다.
+        아직 확정되지 않은 마지막 단어들까지 반환하고 상태를 초기화합니다.
+        """
+        rest = " ".join(w[2] for w in self.hypothesis)
+        self.reset()
+        return rest
+
+    @property
+    def committed_text(self) -> str:
+        """지금까지 확정된 전체 텍스트"""
+        return " ".join(w[2] for w in self.committed)
+
+
+# -------------------------------------------------------------------
+# 간단 CLI 테스트용 (파일을 0.5초씩 흘려보내며 스트리밍 흉내)
+# -------------------------------------------------------------------
+
+if __name__ == "__main__":
+    from speaker.vad import load_audio
+
+    print("스트리밍 STT(LocalAgreement-2) 테스트 모드입니다.")
+    print("음성 파일을 0.5초씩 나눠 넣으면서 확정되는 텍스트를 출력합니다. (종료: 빈 줄)")
+
+    transcriber = OnlineTranscriber()
+    step = SAMPLE_RATE // 2
+
+    while True:
+        path = input("\n음성 파일 경로 > ").strip()
+        if not path:
+            print("종료합니다.")
+            break
+
+        try:
+            audio = load_audio(path).set_frame_rate(SAMPLE_RATE).set_channels(1)
+        except Exception as e:
+            print(f"[ERROR] 오디오 로드 실패: {e}")
+            continue
+
+        samples = np.asarray(audio.get_array_of_samples(), dtype=np.float32)
+        samples /= audio.max_possible_amplitude
+
+        for i in range(0, samples.size, step):
+            transcriber.insert_audio(samples[i:i + step])
+            new_text = transcriber.process()
+            if new_text:
+                print(f"[{(i + step) / SAMPLE_RATE:6.1f}s] {new_text}")
+
+        rest = transcriber.finish()
+        if rest:
+            print(f"[  마무리] {rest}")
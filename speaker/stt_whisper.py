@@ -4,13 +4,17 @@ stt_whisper.py
 
 이 모듈은 음성 파일(또는 바이트)을 OpenAI Whisper(STT) API로 보내서
 '한국어 텍스트'로 변환하는 역할을 합니다.
+STT_BACKEND=local 이면 API 대신 로컬 faster-whisper 모델을 사용합니다.
 
 🎯 역할 요약
 --------------------------------------
-1. .env 에서 OPENAI_API_KEY, WHISPER_MODEL 읽기
+1. .env 에서 OPENAI_API_KEY, WHISPER_MODEL, STT_BACKEND 읽기
 2. 음성 파일 경로를 받아 텍스트로 변환 (transcribe_file)
+   - (API 사용 시) 30초가 넘는 파일은 무음 기준으로 나눠 여러 요청을 병렬로 보냄
 3. 메모리 상의 바이트(녹음 버퍼 등)를 받아 텍스트로 변환 (transcribe_bytes)
-4. 모든 예외는 잡아서 경고 로그를 남기고, 호출 측이 판단하도록 빈 문자열 반환
+4. 이미 열려 있는 파일 객체(BytesIO 등)를 복사 없이 변환 (transcribe_fileobj)
+   - 같은 오디오(sha256 기준)는 다시 호출하지 않고 캐시된 결과를 반환
+5. 모든 예외는 잡아서 경고 로그를 남기고, 호출 측이 판단하도록 빈 문자열 반환
 
 👉 이 모듈은 "오디오 → 텍스트"만 담당하며,
    텍스트를 민원 엔진(minwon_engine)에 넘기는 작업은 main.py/speaker.py 쪽에서 처리합니다.
@@ -18,7 +22,12 @@ stt_whisper.py
 
 import os
 import io
-from typing import Optional
+import wave
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -29,22 +38,166 @@ from openai import OpenAI
 
 load_dotenv()
 
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    raise RuntimeError(".env에 OPENAI_API_KEY가 없습니다. 음성 인식을 위해 API 키를 설정해 주세요.")
+# STT 백엔드 선택
+# - "openai": OpenAI Whisper API (기본값)
+# - "local" : faster-whisper 로컬 모델 (네트워크 왕복 없음, 오프라인 가능)
+STT_BACKEND = os.getenv("STT_BACKEND", "openai").strip().lower()
+if STT_BACKEND not in ("openai", "local"):
+    raise RuntimeError(
+        f".env의 STT_BACKEND 값이 올바르지 않습니다: {STT_BACKEND!r} "
+        "(openai 또는 local 중 하나로 설정해 주세요.)"
+    )
 
-# OpenAI 클라이언트
-client = OpenAI(api_key=API_KEY)
+# 로컬 faster-whisper 설정 (STT_BACKEND=local 일 때만 사용)
+# - compute_type을 비워두면 GPU는 int8_float16, CPU는 int8로 선택
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "large-v2")
+LOCAL_WHISPER_DEVICE = os.getenv("LOCAL_WHISPER_DEVICE", "auto")
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "")
+# 긴 오디오의 30초 구간들을 한 번에 몇 개씩 묶어 추론할지 (1이면 순차 처리)
+LOCAL_WHISPER_BATCH_SIZE = int(os.getenv("LOCAL_WHISPER_BATCH_SIZE", "8"))
+
+
+def _load_local_model():
+    """
+    faster-whisper 모델을 로드합니다. (처음 한 번 로드할 때 시간이 다소 걸릴 수 있음)
+    """
+    import ctranslate2
+    from faster_whisper import WhisperModel
+
+    device = LOCAL_WHISPER_DEVICE
+    if device == "auto":
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    compute_type = LOCAL_WHISPER_COMPUTE_TYPE or (
+        "int8_float16" if device == "cuda" else "int8"
+    )
+    return WhisperModel(LOCAL_WHISPER_MODEL, device=device, compute_type=compute_type)
+
+
+local_model = None
+local_batched = None
+if STT_BACKEND == "local":
+    try:
+        local_model = _load_local_model()
+    except ImportError:
+        print("[WARN] faster-whisper가 설치되어 있지 않아 OpenAI Whisper API를 사용합니다. "
+              "(pip install faster-whisper)")
+        STT_BACKEND = "openai"
+
+if local_model is not None and LOCAL_WHISPER_BATCH_SIZE > 1:
+    try:
+        from faster_whisper import BatchedInferencePipeline
+        local_batched = BatchedInferencePipeline(model=local_model)
+    except ImportError:
+        print("[WARN] 설치된 faster-whisper에 BatchedInferencePipeline이 없어 순차 처리합니다. "
+              "(faster-whisper>=1.1 필요)")
+
+client = None
+if STT_BACKEND == "openai":
+    API_KEY = os.getenv("OPENAI_API_KEY")
+    if not API_KEY:
+        raise RuntimeError(".env에 OPENAI_API_KEY가 없습니다. 음성 인식을 위해 API 키를 설정해 주세요.")
+
+    # OpenAI 클라이언트
+    client = OpenAI(api_key=API_KEY)
 
 # Whisper 모델 이름 (필요하면 .env에서 덮어쓰기)
 # - 기본값은 최신 소형 STT 전용 모델(gpt-4o-mini-transcribe 등)을 가정
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "gpt-4o-mini-transcribe")
 
+# 캐시 키 등에 쓰는 '실제로 사용하는' 모델 이름
+ACTIVE_MODEL = LOCAL_WHISPER_MODEL if STT_BACKEND == "local" else WHISPER_MODEL
+
+# 긴 오디오 병렬 처리 설정
+# - LONG_AUDIO_MS 보다 긴 파일은 CHUNK_MAX_MS 이하 조각으로 나눠 동시에 호출
+# - 무음이 없어 강제로 자르는 곳은 CHUNK_OVERLAP_MS 만큼 겹쳐서 단어 잘림 방지
+# - 각 조각 양 끝에는 CHUNK_KEEP_SILENCE_MS 만큼 여유를 붙여 말끝/말머리 보존
+LONG_AUDIO_MS = 30_000
+CHUNK_MAX_MS = 30_000
+CHUNK_OVERLAP_MS = 1_000
+CHUNK_KEEP_SILENCE_MS = 300
+# 조각을 WAV로 올릴 때 맞출 샘플레이트 (Whisper 내부 처리 기준)
+WHISPER_SAMPLE_RATE = 16000
+STT_MAX_WORKERS = int(os.getenv("STT_MAX_WORKERS", "4"))
+
+# STT 결과 캐시 (같은 녹음 재전송, 재시도 흐름에서 중복 호출 방지)
+# - 키: (오디오 sha256, 모델 이름, 언어) / 값: 인식된 텍스트
+# - 병렬 STT에서 동시에 접근하므로 lock으로 보호
+STT_CACHE_SIZE = int(os.getenv("STT_CACHE_SIZE", "256"))
+_stt_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+_stt_cache_lock = threading.Lock()
+
 # -------------------------------------------------------------------
 # 공통 STT 로직
 # -------------------------------------------------------------------
 
+def _audio_digest(file_obj) -> Optional[str]:
+    """
+    파일 객체 내용의 sha256을 계산하고, 읽기 위치를 원래대로 되돌립니다.
+    (seek이 안 되는 스트림이면 None)
+    """
+    try:
+        pos = file_obj.tell()
+        h = hashlib.sha256()
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            h.update(block)
+        file_obj.seek(pos)
+        return h.hexdigest()
+    except Exception:
+        return None
+
+
 def _call_whisper(file_obj, language: str = "ko") -> str:
+    """
+    캐시를 먼저 확인하고, 없을 때만 Whisper API를 호출하는 내부 함수.
+
+    :param file_obj: 바이너리 모드로 연 열린 파일 객체 (또는 BytesIO)
+    :param language: 음성 언어 코드 (기본값 'ko' = 한국어)
+    :return: 변환된 텍스트 (실패 시 빈 문자열)
+    """
+    key = _cache_key(file_obj, language)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    if STT_BACKEND == "local":
+        text = _request_local_whisper(file_obj, language=language)
+    else:
+        text = _request_whisper(file_obj, language=language)
+
+    _cache_put(key, text)
+    return text
+
+
+def _cache_key(file_obj, language: str) -> Optional[Tuple[str, str, str]]:
+    """파일 객체 내용 기준 캐시 키 (해시를 못 구하면 None)"""
+    digest = _audio_digest(file_obj)
+    return (digest, ACTIVE_MODEL, language) if digest else None
+
+
+def _cache_get(key: Optional[Tuple[str, str, str]]) -> Optional[str]:
+    """캐시된 텍스트를 반환합니다. (없으면 None)"""
+    if key is None:
+        return None
+    with _stt_cache_lock:
+        cached = _stt_cache.get(key)
+        if cached is not None:
+            _stt_cache.move_to_end(key)
+        return cached
+
+
+def _cache_put(key: Optional[Tuple[str, str, str]], text: str):
+    """인식 결과를 캐시에 저장합니다."""
+    # 실패(빈 문자열)는 캐시하지 않아야 재시도 시 다시 호출됨
+    if key is None or not text:
+        return
+    with _stt_cache_lock:
+        _stt_cache[key] = text
+        _stt_cache.move_to_end(key)
+        while len(_stt_cache) > STT_CACHE_SIZE:
+            _stt_cache.popitem(last=False)
+
+
+def _request_whisper(file_obj, language: str = "ko") -> str:
     """
     실제로 OpenAI Whisper API를 호출하는 내부 함수.
 
@@ -72,6 +225,37 @@ def _call_whisper(file_obj, language: str = "ko") -> str:
         return ""
 
 
+def _request_local_whisper(file_obj, language: str = "ko") -> str:
+    """
+    로컬 faster-whisper 모델로 변환하는 내부 함수.
+
+    :param file_obj: 바이너리 모드로 연 열린 파일 객체 (또는 BytesIO)
+    :param language: 음성 언어 코드 (기본값 'ko' = 한국어)
+    :return: 변환된 텍스트 (실패 시 빈 문자열)
+    """
+    try:
+        # segments는 generator이므로 실제 디코딩은 순회하면서 진행됨
+        if local_batched is not None:
+            # VAD로 나눈 음성 구간들을 batch_size개씩 묶어 한 번에 encoder/decoder 통과
+            segments, _ = local_batched.transcribe(
+                file_obj,
+                language=language,
+                beam_size=1,
+                batch_size=LOCAL_WHISPER_BATCH_SIZE,
+            )
+        else:
+            segments, _ = local_model.transcribe(
+                file_obj,
+                language=language,
+                beam_size=1,
+                vad_filter=True,
+            )
+        return " ".join(seg.text.strip() for seg in segments).strip()
+    except Exception as e:
+        print(f"[WARN] faster-whisper STT 처리 중 오류 발생: {e}")
+        return ""
+
+
 # -------------------------------------------------------------------
 # 외부에서 사용할 공개 함수들
 # -------------------------------------------------------------------
@@ -92,6 +276,39 @@ def transcribe_file(path: str,
         print(f"[WARN] STT 대상 파일을 찾을 수 없습니다: {path}")
         return ""
 
+    # API 사용 시: 헤더/ffprobe로 길이만 먼저 확인하고, 긴 파일일 때만 디코딩
+    # (길이를 모르거나 디코딩에 실패하면 기존처럼 파일 전체를 그대로 전송)
+    # 로컬 모델은 긴 오디오도 내부에서 30초 단위로 (가능하면 batch로) 처리하므로 나누지 않음
+    if STT_BACKEND == "openai":
+        duration_ms = _probe_duration_ms(path)
+        if duration_ms is not None and duration_ms > LONG_AUDIO_MS:
+            # 같은 파일을 다시 올린 경우 디코딩/분할 전에 파일 전체 해시로 바로 반환
+            try:
+                with open(path, "rb") as f:
+                    key = _cache_key(f, language)
+            except Exception:
+                key = None
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached
+
+            try:
+                # numpy/pydub가 필요한 VAD는 긴 파일을 나눌 때만 불러옴
+                # (python speaker/stt_whisper.py 로 직접 실행할 때도 import 오류 없이 동작)
+                from speaker.vad import load_audio
+                audio = load_audio(path)
+            except Exception as e:
+                print(f"[WARN] 오디오 디코딩 실패, 파일 전체로 STT 진행: {e}")
+                audio = None
+
+            if audio is not None:
+                text, complete = _transcribe_long_audio(audio, language=language)
+                # 일부 조각이 실패한 결과는 캐시하지 않아야 재시도 시 다시 호출됨
+                # (성공한 조각은 조각별 캐시에 남아 있으므로 다시 과금되지 않음)
+                if complete:
+                    _cache_put(key, text)
+                return text
+
     try:
         with open(path, "rb") as f:
             return _call_whisper(f, language=language)
@@ -121,11 +338,148 @@ def transcribe_bytes(audio_bytes: bytes,
 
     # BytesIO로 감싸서 파일처럼 사용
     bio = io.BytesIO(audio_bytes)
+    return transcribe_fileobj(bio, language=language, file_name=file_name)
+
+
+def transcribe_fileobj(file_obj: BinaryIO,
+                       language: str = "ko",
+                       file_name: Optional[str] = None) -> str:
+    """
+    이미 열려 있는 바이너리 파일 객체를 받아 텍스트로 변환합니다.
+
+    - AudioSegment.export()로 채운 BytesIO 등을 그대로 넘길 수 있어
+      bytes로 한 번 더 복사하지 않아도 됩니다.
+    - 파일 객체는 현재 위치부터 읽으므로, 호출 측에서 seek(0) 해 두어야 합니다.
+
+    :param file_obj: 바이너리 모드 파일 객체 (BytesIO, 임시 파일 등)
+    :param language: 음성 언어 코드
+    :param file_name: 임시 파일명 (예: "segment.wav")
+    :return: 인식된 텍스트 (실패 시 빈 문자열)
+    """
     # 일부 클라이언트 구현에서는 name 속성을 보고 포맷을 추측하기도 함
-    if file_name:
-        bio.name = file_name  # type: ignore[attr-defined]
+    # (open()으로 연 실제 파일은 name이 읽기 전용이고 이미 경로가 들어 있으므로 건드리지 않음)
+    if file_name and isinstance(file_obj, io.BytesIO):
+        file_obj.name = file_name  # type: ignore[attr-defined]
+
+    return _call_whisper(file_obj, language=language)
+
+
+# -------------------------------------------------------------------
+# 긴 오디오: 분할 + 병렬 STT
+# -------------------------------------------------------------------
+
+def _probe_duration_ms(path: str) -> Optional[float]:
+    """
+    전체 디코딩 없이 오디오 길이(ms)를 알아냅니다.
+    PCM WAV는 헤더만 읽고, 그 외 포맷은 ffprobe(pydub.utils.mediainfo)를 사용합니다.
+    (알 수 없으면 None)
+    """
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as w:
+                return w.getnframes() * 1000.0 / w.getframerate()
+        except Exception:
+            pass  # PCM이 아닌 WAV 등은 ffprobe로 재시도
+
+    try:
+        from pydub.utils import mediainfo
+        return float(mediainfo(path)["duration"]) * 1000.0
+    except Exception:
+        return None
+
+
+def _plan_windows(ranges: List[Tuple[int, int]],
+                  max_ms: int = CHUNK_MAX_MS,
+                  overlap_ms: int = CHUNK_OVERLAP_MS) -> List[Tuple[int, int, bool]]:
+    """
+    VAD 음성 구간들을 max_ms 이하의 STT 요청 단위(window)로 묶습니다.
+
+    - 이어지는 음성 구간은 max_ms를 넘지 않는 한 하나의 window로 합침
+    - 한 구간이 max_ms보다 길면 overlap_ms 만큼 겹치게 강제로 자름
+
+    :return: [(start_ms, end_ms, 이전 window와 겹치는지 여부), ...]
+    """
+    windows: List[Tuple[int, int, bool]] = []
+    for start, end in ranges:
+        pieces: List[Tuple[int, int]] = []
+        cursor = start
+        while end - cursor > max_ms:
+            pieces.append((cursor, cursor + max_ms))
+            cursor += max_ms - overlap_ms
+        pieces.append((cursor, end))
+
+        for i, (p_start, p_end) in enumerate(pieces):
+            overlapped = i > 0
+            if not overlapped and windows and p_end - windows[-1][0] <= max_ms:
+                w_start, _, w_overlapped = windows[-1]
+                windows[-1] = (w_start, p_end, w_overlapped)
+            else:
+                windows.append((p_start, p_end, overlapped))
+    return windows
+
+
+def _join_overlapping(texts: List[str],
+                      overlapped: List[bool],
+                      max_tokens: int = 8) -> str:
+    """
+    window별 STT 결과를 이어 붙입니다.
+
+    겹치게 자른 window는 앞 결과의 끝 단어들과 뒤 결과의 첫 단어들이
+    중복될 수 있으므로, 가장 길게 일치하는 부분(최대 max_tokens 단어)을 한 번만 남깁니다.
+    """
+    def _key(word: str) -> str:
+        return word.strip(".,?!")
+
+    words: List[str] = []
+    for text, is_overlapped in zip(texts, overlapped):
+        tokens = text.split()
+        if is_overlapped and words:
+            limit = min(max_tokens, len(words), len(tokens))
+            for k in range(limit, 0, -1):
+                if [_key(w) for w in words[-k:]] == [_key(w) for w in tokens[:k]]:
+                    tokens = tokens[k:]
+                    break
+        words.extend(tokens)
+    return " ".join(words)
+
+
+def _transcribe_long_audio(audio, language: str = "ko") -> Tuple[str, bool]:
+    """
+    긴 AudioSegment를 무음 기준 window로 나눠 병렬로 STT 한 뒤 이어 붙입니다.
+
+    :return: (이어 붙인 텍스트, 모든 window가 텍스트를 돌려줬는지 여부)
+    """
+    from speaker.vad import detect_speech_ranges
+
+    # 양 끝 여유를 붙여도 CHUNK_MAX_MS를 넘지 않도록 그만큼 작게 묶음
+    windows = _plan_windows(
+        detect_speech_ranges(audio),
+        max_ms=CHUNK_MAX_MS - 2 * CHUNK_KEEP_SILENCE_MS,
+    )
+    if not windows:
+        return "", True
+
+    def _run(window: Tuple[int, int, bool]) -> str:
+        start_ms, end_ms, _ = window
+        start_ms = max(start_ms - CHUNK_KEEP_SILENCE_MS, 0)
+        end_ms = min(end_ms + CHUNK_KEEP_SILENCE_MS, len(audio))
+        buf = io.BytesIO()
+        # Whisper 입력 기준(16kHz mono)으로 맞춰 업로드 크기를 줄임
+        # (44.1kHz 스테레오 그대로면 30초에 약 5MB → 16kHz mono는 약 1MB)
+        segment = audio[start_ms:end_ms].set_frame_rate(WHISPER_SAMPLE_RATE).set_channels(1)
+        segment.export(buf, format="wav")
+        buf.seek(0)
+        return transcribe_fileobj(buf, language=language, file_name="chunk.wav")
+
+    with ThreadPoolExecutor(max_workers=STT_MAX_WORKERS) as ex:
+        texts = list(ex.map(_run, windows))
+
+    missing = [i for i, text in enumerate(texts) if not text]
+    if missing:
+        print(f"[WARN] 긴 오디오 STT 중 {len(missing)}/{len(windows)}개 구간의 결과가 비어 있습니다. "
+              f"(구간 번호: {missing}) 일부 내용이 빠졌을 수 있습니다.")
 
-    return _call_whisper(bio, language=language)
+    return _join_overlapping(texts, [w[2] for w in windows]), not missing
 
 
 # -------------------------------------------------------------------
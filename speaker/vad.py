@@ -2,25 +2,30 @@
 """
 vad.py
 
-이 모듈은 pydub를 활용해서
+이 모듈은 pydub로 오디오를 한 번 디코딩한 뒤,
+numpy로 10ms 프레임별 음량(dBFS)을 한꺼번에 계산해서
 '무음(silence)' 구간을 기준으로 음성을 잘라내는
 간단한 VAD(Voice Activity Detection) 유틸리티입니다.
 
 🎯 역할 요약
 --------------------------------------
 1. 음성 파일에서 앞·뒤 무음 제거 (trim_silence)
-2. 음성 파일을 여러 발화(chunk)로 나누기 (split_into_chunks)
-3. 각 chunk의 시작/끝 시각(sec)을 함께 반환
+2. 음성 구간(ms) 목록 찾기 (detect_speech_ranges)
+3. 음성 파일을 여러 발화(chunk)로 나누기 (split_into_chunks)
+4. 각 chunk의 시작/끝 시각(sec)을 함께 반환
 
 👉 pyannote.audio의 고급 diarization과는 별도로,
    단순히 "무음 기준으로 발화 단위 나누기"가 필요할 때 사용합니다.
 """
 
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
+import numpy as np
 from pydub import AudioSegment
-from pydub.silence import split_on_silence
+
+# 음량을 계산하는 프레임 단위(ms)
+FRAME_MS = 10
 
 
 # -------------------------------------------------------------------
@@ -39,6 +44,50 @@ def load_audio(path: str) -> AudioSegment:
     return AudioSegment.from_file(path)
 
 
+def frame_dbfs(audio: AudioSegment, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """
+    오디오를 frame_ms 단위 프레임으로 나눠, 프레임별 dBFS를 한 번에 계산합니다.
+
+    audio[ms:ms + 10].dBFS 를 반복 호출하면 프레임마다 AudioSegment가
+    새로 만들어지므로, 샘플 배열을 한 번만 꺼내 numpy로 계산합니다.
+    프레임 i는 pydub의 audio[i * frame_ms:(i + 1) * frame_ms] 와 같은 샘플 구간이므로
+    (10ms가 정수 샘플이 아닌 22.05kHz 등에서도) 인덱스 i는 정확히 i * frame_ms ms 입니다.
+
+    :param audio: AudioSegment 객체
+    :param frame_ms: 프레임 길이(ms)
+    :return: 프레임별 dBFS 배열 (완전 무음은 -inf)
+    """
+    channels = audio.channels
+    n_samples = int(audio.frame_count())
+    if n_samples == 0:
+        return np.full(0, -np.inf)
+
+    # pydub 슬라이싱과 같은 규칙으로 프레임 경계(샘플 단위) 계산
+    n_frames = -(-(n_samples * 1000) // (audio.frame_rate * frame_ms))
+    bounds = np.arange(n_frames + 1, dtype=np.int64) * frame_ms * audio.frame_rate // 1000
+    bounds[-1] = n_samples
+    counts = np.diff(bounds) * channels
+
+    # float32 복사본 하나만 만들고, 제곱은 그 자리에서 계산
+    power = np.asarray(audio.get_array_of_samples()).astype(np.float32)
+    np.square(power, out=power)
+
+    # 채널이 여러 개면 샘플이 interleave 되어 있으므로 경계에 채널 수를 곱함
+    sums = np.add.reduceat(power, bounds[:-1] * channels, dtype=np.float64)
+    rms = np.sqrt(sums / counts)
+
+    with np.errstate(divide="ignore"):
+        return 20 * np.log10(rms / audio.max_possible_amplitude)
+
+
+def _true_runs(mask: np.ndarray) -> np.ndarray:
+    """
+    bool 배열에서 True가 연속된 구간들을 [[시작, 끝), ...] 인덱스 배열로 반환합니다.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+
 def trim_silence(audio: AudioSegment,
                  silence_thresh: int = -40,
                  padding_ms: int = 200) -> AudioSegment:
@@ -62,23 +111,48 @@ def trim_silence(audio: AudioSegment,
     if len(audio) < 2 * padding_ms:
         return audio
 
-    # 앞쪽 무음 찾기: 처음 non-silence 샘플 위치
-    start = 0
-    for ms in range(0, len(audio), 10):
-        if audio[ms:ms + 10].dBFS > silence_thresh:
-            start = max(ms - padding_ms, 0)
-            break
+    # 10ms 프레임별 dBFS를 한 번에 계산해 두고, 앞/뒤에서 처음 소리가 나는 프레임 찾기
+    loud = np.flatnonzero(frame_dbfs(audio) > silence_thresh)
+    if loud.size == 0:
+        return audio
 
-    # 뒤쪽 무음 찾기: 끝에서부터 non-silence
-    end = len(audio)
-    for ms in range(len(audio) - 10, 0, -10):
-        if audio[ms:ms + 10].dBFS > silence_thresh:
-            end = min(ms + padding_ms, len(audio))
-            break
+    # 앞쪽 무음: 처음 non-silence 프레임 시작에서 padding만큼 앞
+    start = max(int(loud[0]) * FRAME_MS - padding_ms, 0)
+    # 뒤쪽 무음: 마지막 non-silence 프레임 시작에서 padding만큼 뒤
+    end = min(int(loud[-1]) * FRAME_MS + padding_ms, len(audio))
 
     return audio[start:end]
 
 
+def detect_speech_ranges(audio: AudioSegment,
+                         min_silence_len: int = 700,
+                         silence_thresh: int = -40) -> List[Tuple[int, int]]:
+    """
+    무음이 min_silence_len 이상 이어지는 곳을 경계로, 음성 구간(ms) 목록을 반환합니다.
+
+    :param audio: AudioSegment 객체
+    :param min_silence_len: 이 길이(ms) 이상이면서
+                            silence_thresh보다 조용하면 '무음'으로 간주
+    :param silence_thresh: 이 dBFS 이하를 무음으로 간주
+    :return: [(start_ms, end_ms), ...] (시간 순)
+    """
+    db = frame_dbfs(audio)
+    if db.size == 0:
+        return []
+
+    # 충분히 긴 무음 구간만 '끊는 지점'으로 사용
+    min_frames = max(-(-min_silence_len // FRAME_MS), 1)
+    long_silence = np.zeros(db.size, dtype=bool)
+    for s, e in _true_runs(db <= silence_thresh):
+        if e - s >= min_frames:
+            long_silence[s:e] = True
+
+    return [
+        (int(s) * FRAME_MS, min(int(e) * FRAME_MS, len(audio)))
+        for s, e in _true_runs(~long_silence)
+    ]
+
+
 def split_into_chunks(path: str,
                       min_silence_len: int = 700,
                       silence_thresh: int = -40,
@@ -86,8 +160,8 @@ def split_into_chunks(path: str,
     """
     음성 파일을 무음 기준으로 여러 chunk로 나눕니다.
 
-    내부적으로 pydub.silence.split_on_silence를 사용하며,
-    각 chunk의 시작/끝 시각(sec)과 AudioSegment를 함께 반환합니다.
+    detect_speech_ranges로 음성 구간을 찾은 뒤, 양 끝에 keep_silence만큼
+    여유를 붙여 자릅니다. start/end는 원본 파일 기준 절대 시각(sec)입니다.
 
     :param path: 오디오 파일 경로
     :param min_silence_len: 이 길이(ms) 이상이면서
@@ -101,32 +175,33 @@ def split_into_chunks(path: str,
     ]
     """
     audio = load_audio(path)
-    chunks = split_on_silence(
+    ranges = detect_speech_ranges(
         audio,
         min_silence_len=min_silence_len,
         silence_thresh=silence_thresh,
-        keep_silence=keep_silence,
     )
 
-    results: List[Dict[str, Any]] = []
-
-    # split_on_silence는 chunk의 절대 시간 정보를 주지 않기 때문에
-    # 단순히 chunk 길이를 누적하면서 start/end를 계산합니다.
-    cursor_ms = 0
-    for idx, chunk in enumerate(chunks):
-        duration_ms = len(chunk)
-        start_sec = cursor_ms / 1000.0
-        end_sec = (cursor_ms + duration_ms) / 1000.0
+    # 양 끝에 keep_silence 여유 추가
+    # (이웃 chunk와 겹치면 pydub split_on_silence처럼 가운데에서 나눔)
+    padded = [
+        [max(start - keep_silence, 0), min(end + keep_silence, len(audio))]
+        for start, end in ranges
+    ]
+    for prev, cur in zip(padded, padded[1:]):
+        if prev[1] > cur[0]:
+            mid = (prev[1] + cur[0]) // 2
+            prev[1] = mid
+            cur[0] = mid
 
+    results: List[Dict[str, Any]] = []
+    for idx, (start_ms, end_ms) in enumerate(padded):
         results.append({
             "index": idx,
-            "start": start_sec,
-            "end": end_sec,
-            "audio": chunk,
+            "start": start_ms / 1000.0,
+            "end": end_ms / 1000.0,
+            "audio": audio[start_ms:end_ms],
         })
 
-        cursor_ms += duration_ms
-
     return results
 
 
@@ -135,7 +210,7 @@ def split_into_chunks(path: str,
 # -------------------------------------------------------------------
 
 if __name__ == "__main__":
-    print("VAD(split_on_silence) 테스트 모드입니다.")
+    print("VAD(무음 기준 chunk 분리) 테스트 모드입니다.")
     print("음성 파일 경로를 입력하면, 무음 기준으로 chunk를 나눕니다. (종료: 빈 줄)")
 
     while True: